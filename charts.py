@@ -1,17 +1,237 @@
-from typing import Any, Literal, Optional
-from quickchart import QuickChart
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Any, AsyncIterator, Literal, Optional
+from urllib.parse import quote_plus, urlencode
 
+import anyio
+import httpx
+import msgspec
+import orjson
 from fastmcp import FastMCP
 
+try:
+    import uvloop  # noqa: F401
+except ImportError:
+    _HAS_UVLOOP = False
+else:
+    _HAS_UVLOOP = True
+
+CHART_BASE = "https://quickchart.io/chart"
+_CREATE_URL = f"{CHART_BASE}/create"
+_GET_PREFIX = f"{CHART_BASE}?c="
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# GET query keys for width, height, format, background_color,
+# device_pixel_ratio and version, in _options_query's argument order
+_GET_OPTION_KEYS = ("w", "h", "f", "bkg", "devicePixelRatio", "v")
+
+# pooled HTTP/2 client shared by every QuickChart request
+_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(10.0),
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=1,
+        limits=httpx.Limits(
+            max_keepalive_connections=20,
+            max_connections=50,
+            keepalive_expiry=300,
+        ),
+    ),
+)
+
+# upper bound for both the GET URL cache and the short URL cache
+_URL_CACHE_SIZE = 1024
+
+# short URLs already returned by /create, keyed by the sorted request body,
+# with the monotonic time they were stored
+_short_urls: dict[bytes, tuple[str, float]] = {}
+
+# QuickChart expires short URLs after a few days, so stop reusing them well before that
+_SHORT_URL_TTL = 24 * 60 * 60
+
+# /create requests still in flight, keyed the same way, so concurrent
+# duplicates share one upstream call
+_inflight: dict[bytes, asyncio.Task[str]] = {}
+
+# each config is serialized once with these options; the bytes feed the GET
+# URL, the /create body and both caches
+_CONFIG_JSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+async def _warm_up() -> None:
+    """Opens a pooled connection to QuickChart so the first chart skips DNS, TCP and TLS setup."""
+    try:
+        await _client.head(_CREATE_URL)
+    except httpx.HTTPError:
+        # nothing to warm if QuickChart is unreachable; real requests report the error
+        pass
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Warms the shared client in the background for the length of a session."""
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(_warm_up)
+        yield
+        tg.cancel_scope.cancel()
+
+
 mcp = FastMCP(
     "QuickChart Server",
     instructions="Provides a tool to generate chart image URLs using QuickChart.io based on Chart.js configuration. Also provides schema information via a resource.",
+    lifespan=lifespan,
     # Add dependencies required if deploying via `fastmcp install`
-    dependencies=["quickchart.io>=2.0.0"],
+    dependencies=["httpx[http2]>=0.28.1", "orjson>=3.10", "msgspec>=0.18"],
 )
 
+
+class ChartRequest(
+    msgspec.Struct,
+    omit_defaults=True,
+    rename={
+        "config": "chart",
+        "background_color": "backgroundColor",
+        "device_pixel_ratio": "devicePixelRatio",
+    },
+):
+    """Request body for QuickChart's /create endpoint; unset options are left out."""
+
+    config: msgspec.Raw
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[Literal["png", "svg"]] = None
+    background_color: Optional[str] = None
+    device_pixel_ratio: Optional[float] = None
+    version: Optional[str] = None
+
+
+_encode_request = msgspec.json.Encoder(order="sorted").encode
+
+
+@functools.lru_cache(maxsize=64)
+def _options_query(
+    width: Optional[int],
+    height: Optional[int],
+    format: Optional[str],
+    background_color: Optional[str],
+    device_pixel_ratio: Optional[float],
+    version: Optional[str],
+) -> str:
+    """Returns the '&...' query suffix for one combination of GET options."""
+    values = (width, height, format, background_color, device_pixel_ratio, version)
+    options = {k: v for k, v in zip(_GET_OPTION_KEYS, values) if v is not None}
+    return f"&{urlencode(options)}" if options else ""
+
+
+@functools.lru_cache(maxsize=_URL_CACHE_SIZE)
+def _build_url(
+    config: bytes,
+    width: Optional[int],
+    height: Optional[int],
+    format: Optional[str],
+    background_color: Optional[str],
+    device_pixel_ratio: Optional[float],
+    version: Optional[str],
+) -> str:
+    """Builds the full GET URL for an already-serialized chart config."""
+    return (
+        _GET_PREFIX
+        + quote_plus(config)
+        + _options_query(width, height, format, background_color, device_pixel_ratio, version)
+    )
+
+
+async def _create_short_url(body: bytes) -> str:
+    """Returns the short URL for a serialized chart payload, from cache or QuickChart's /create endpoint."""
+    if (entry := _short_urls.pop(body, None)) is not None:
+        url, stored_at = entry
+        if monotonic() - stored_at < _SHORT_URL_TTL:
+            # re-insert so the dict stays in least-recently-used order
+            _short_urls[body] = entry
+            return url
+
+    if (task := _inflight.get(body)) is None:
+        task = asyncio.ensure_future(_post_create(body))
+        _inflight[body] = task
+        task.add_done_callback(lambda t: _finish_inflight(body, t))
+    # shield so one caller being cancelled does not cancel the shared request
+    return await asyncio.shield(task)
+
+
+def _finish_inflight(body: bytes, task: asyncio.Task[str]) -> None:
+    """Drops a finished /create request from the in-flight map."""
+    _inflight.pop(body, None)
+    if not task.cancelled():
+        # mark the exception as retrieved in case every waiter was cancelled
+        task.exception()
+
+
+async def _post_create(body: bytes) -> str:
+    """POSTs a serialized chart payload to QuickChart's /create endpoint and caches the short URL."""
+    resp = await _client.post(
+        _CREATE_URL,
+        content=body,
+        headers=_JSON_HEADERS,
+    )
+    if resp.status_code != 200:
+        detail = resp.headers.get("x-quickchart-error")
+        raise RuntimeError(
+            f"Invalid response code from chart creation endpoint: {resp.status_code}"
+            + (f"\n{detail}" if detail else "")
+        )
+    data = orjson.loads(resp.content)
+    if not data.get("success"):
+        raise RuntimeError("Chart creation endpoint failed to create chart")
+
+    url = data["url"]
+    _short_urls[body] = (url, monotonic())
+    if len(_short_urls) > _URL_CACHE_SIZE:
+        del _short_urls[next(iter(_short_urls))]
+    return url
+
+
+async def _chart_url(
+    config: dict[str, Any],
+    width: Optional[int],
+    height: Optional[int],
+    format: Optional[str],
+    background_color: Optional[str],
+    device_pixel_ratio: Optional[float],
+    version: Optional[str],
+    short: bool,
+) -> str:
+    """Builds or fetches one chart URL, turning any failure into the tool's error string."""
+    try:
+        chart = orjson.dumps(config, option=_CONFIG_JSON_OPTIONS)
+        if not short:
+            return _build_url(
+                chart,
+                width,
+                height,
+                format,
+                background_color,
+                device_pixel_ratio,
+                version,
+            )
+
+        request = ChartRequest(
+            msgspec.Raw(chart),
+            width,
+            height,
+            format,
+            background_color,
+            device_pixel_ratio,
+            version,
+        )
+        return await _create_short_url(_encode_request(request))
+    except Exception as e:
+        return f"Error generating QuickChart URL: {e}"
+
+
 @mcp.tool()
-def create_chart_url(
+async def create_chart_url(
     config: dict[str, Any],
     width: Optional[int] = None,
     height: Optional[int] = None,
@@ -19,6 +239,7 @@ def create_chart_url(
     background_color: Optional[str] = None,
     device_pixel_ratio: Optional[float] = None,
     version: Optional[str] = None,
+    short: bool = False,
 ) -> str:
     """
     Generates a QuickChart URL based on a Chart.js configuration object.
@@ -38,6 +259,8 @@ def create_chart_url(
         background_color (Optional[str]): Background color (default: '#ffffff').
         device_pixel_ratio (Optional[float]): Device pixel ratio (default: 1.0).
         version (Optional[str]): Chart.js version (e.g., '3').
+        short (bool): Return a short URL from QuickChart's /create endpoint
+            instead of building the full chart URL locally (default: False).
 
     Example minimal 'config' for a bar chart:
     {
@@ -50,42 +273,64 @@ def create_chart_url(
 
     For more detailed structure examples and common options, read the resource at 'resource://chartjs-schema-info'.
     """
-    qc = QuickChart()
-
-    # setting mandatory config
-    if not isinstance(config, dict):
-        return "Error: 'config' parameter must be a valid dictionary (JSON object)."
-    qc.config = config
-
-    if width is not None:
-        qc.width = width
-    if height is not None:
-        qc.height = height
-    if format is not None:
-        qc.format = format
-    if background_color is not None:
-        qc.background_color = background_color
-    if device_pixel_ratio is not None:
-        qc.device_pixel_ratio = device_pixel_ratio
-    if version is not None:
-        qc.version = version
+    return await _chart_url(
+        config,
+        width,
+        height,
+        format,
+        background_color,
+        device_pixel_ratio,
+        version,
+        short,
+    )
 
-    try:
-        url = qc.get_short_url()
-        return url
-    except Exception as e:
-        return f"Error generating QuickChart URL: {e}"
 
+@mcp.tool()
+async def create_chart_urls(
+    configs: list[dict[str, Any]],
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    format: Optional[Literal["png", "svg"]] = "png",
+    background_color: Optional[str] = None,
+    device_pixel_ratio: Optional[float] = None,
+    version: Optional[str] = None,
+    short: bool = False,
+) -> list[str]:
+    """
+    Generates QuickChart URLs for several Chart.js configuration objects at once,
+    e.g. all the charts of one dashboard.
 
-@mcp.resource(
-    uri="resource://chartjs-schema-info",
-    name="ChartJsSchemaInfo",
-    description="Provides examples and key schema details for Chart.js configurations used by QuickChart.",
-    mime_type="text/plain",
-)
-def get_chartjs_schema_info() -> str:
-    """Returns helpful schema information and examples for Chart.js config."""
-    info = """
+    Args:
+        configs (list[dict]): Chart.js configuration objects, in the same shape as
+            'config' for create_chart_url.
+        width, height, format, background_color, device_pixel_ratio, version, short:
+            Applied to every chart; see create_chart_url.
+
+    Returns one URL per config, in the same order. A chart that fails gets an
+    error message in its slot instead of failing the whole batch.
+    """
+    return list(
+        await asyncio.gather(
+            *(
+                _chart_url(
+                    config,
+                    width,
+                    height,
+                    format,
+                    background_color,
+                    device_pixel_ratio,
+                    version,
+                    short,
+                )
+                for config in configs
+            )
+        )
+    )
+
+
+# kept as str: FastMCP sends a resource that returns bytes as a base64 blob,
+# not as text/plain, and stdio encodes the whole JSON-RPC message anyway
+_SCHEMA_INFO = """
             Chart.js Configuration Structure for QuickChart:
 
             The main keys are 'type', 'data', and optionally 'options'.
@@ -151,7 +396,26 @@ def get_chartjs_schema_info() -> str:
                 }
             }
         """
-    return info
+
+
+@mcp.resource(
+    uri="resource://chartjs-schema-info",
+    name="ChartJsSchemaInfo",
+    description="Provides examples and key schema details for Chart.js configurations used by QuickChart.",
+    mime_type="text/plain",
+)
+def get_chartjs_schema_info() -> str:
+    """Returns helpful schema information and examples for Chart.js config."""
+    return _SCHEMA_INFO
+
+
+async def serve() -> None:
+    """Runs the server over stdio and closes the shared client on exit."""
+    try:
+        await mcp.run_async(transport='stdio')
+    finally:
+        await _client.aclose()
+
 
 if __name__ == "__main__":
-    mcp.run(transport='stdio')
\ No newline at end of file
+    anyio.run(serve, backend_options={"use_uvloop": _HAS_UVLOOP})
\ No newline at end of file
@@ -0,0 +1,233 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+import anyio
+import httpx
+import pytest
+
+import charts
+
+# newer FastMCP releases wrap decorated tools; call the underlying coroutine either way
+create_chart_url = getattr(charts.create_chart_url, "fn", charts.create_chart_url)
+create_chart_urls = getattr(charts.create_chart_urls, "fn", charts.create_chart_urls)
+
+
+@pytest.fixture(autouse=True)
+def clear_url_caches():
+    charts._build_url.cache_clear()
+    charts._options_query.cache_clear()
+    charts._short_urls.clear()
+    charts._inflight.clear()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Swaps the shared client for one backed by a mock transport."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"success": True, "url": "https://quickchart.io/chart/render/abc"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(charts, "_client", client)
+    return seen
+
+
+def test_create_chart_url_builds_get_url_locally(upstream):
+    config = {"type": "bar", "data": {"labels": ["a"], "datasets": [{"label": "x", "data": [1]}]}}
+
+    url = anyio.run(lambda: create_chart_url(config, width=400, height=None))
+
+    assert upstream == []
+    base, _, query = url.partition("?")
+    assert base == charts.CHART_BASE
+    params = parse_qs(query)
+    assert json.loads(params["c"][0]) == config
+    assert params["w"] == ["400"]
+    assert params["f"] == ["png"]
+    assert "h" not in params
+
+
+def test_get_url_without_options_is_just_the_config():
+    url = anyio.run(lambda: create_chart_url({"type": "pie"}, format=None))
+
+    assert url == "https://quickchart.io/chart?c=%7B%22type%22%3A%22pie%22%7D"
+
+
+def test_charts_with_the_same_options_share_the_query_suffix():
+    first = anyio.run(lambda: create_chart_url({"type": "bar"}, width=500, height=300))
+    second = anyio.run(lambda: create_chart_url({"type": "line"}, width=500, height=300))
+
+    assert first.endswith("&w=500&h=300&f=png")
+    assert second.endswith("&w=500&h=300&f=png")
+    assert charts._options_query.cache_info().hits == 1
+
+
+def test_create_chart_url_posts_through_shared_client(upstream):
+    config = {"type": "bar", "data": {"labels": ["a"], "datasets": [{"label": "x", "data": [1]}]}}
+
+    url = anyio.run(lambda: create_chart_url(config, width=400, background_color="#000", short=True))
+
+    assert url == "https://quickchart.io/chart/render/abc"
+    assert len(upstream) == 1
+    request = upstream[0]
+    assert request.method == "POST"
+    assert str(request.url) == "https://quickchart.io/chart/create"
+    assert request.headers["content-type"] == "application/json"
+    assert json.loads(request.content) == {
+        "chart": config,
+        "width": 400,
+        "format": "png",
+        "backgroundColor": "#000",
+    }
+
+
+def test_config_with_non_string_keys_is_serialized(upstream):
+    config = {"type": "bar", "data": {"datasets": [{"data": {1: 5, 2: 7}}]}}
+
+    url = anyio.run(lambda: create_chart_url(config))
+    anyio.run(lambda: create_chart_url(config, short=True))
+
+    expected = {"type": "bar", "data": {"datasets": [{"data": {"1": 5, "2": 7}}]}}
+    assert json.loads(parse_qs(url.partition("?")[2])["c"][0]) == expected
+    assert json.loads(upstream[0].content)["chart"] == expected
+
+
+def test_repeated_short_url_requests_hit_the_cache(upstream):
+    first = anyio.run(lambda: create_chart_url({"type": "bar", "data": {}}, short=True))
+    second = anyio.run(lambda: create_chart_url({"data": {}, "type": "bar"}, short=True))
+
+    assert first == second
+    assert len(upstream) == 1
+
+
+def test_short_url_cache_expires_after_ttl(upstream, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(charts, "monotonic", lambda: now)
+
+    anyio.run(lambda: create_chart_url({"type": "bar"}, short=True))
+    now += charts._SHORT_URL_TTL - 1
+    anyio.run(lambda: create_chart_url({"type": "bar"}, short=True))
+    assert len(upstream) == 1
+
+    now += 2
+    anyio.run(lambda: create_chart_url({"type": "bar"}, short=True))
+    assert len(upstream) == 2
+
+
+def test_concurrent_duplicate_short_url_requests_share_one_upstream_call(monkeypatch):
+    seen: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        await anyio.sleep(0.01)
+        return httpx.Response(200, json={"success": True, "url": "https://quickchart.io/chart/render/abc"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(charts, "_client", client)
+
+    async def run_duplicates():
+        return await asyncio.gather(*(create_chart_url({"type": "bar"}, short=True) for _ in range(3)))
+
+    urls = anyio.run(run_duplicates)
+
+    assert urls == ["https://quickchart.io/chart/render/abc"] * 3
+    assert len(seen) == 1
+    assert charts._inflight == {}
+
+
+def test_create_chart_url_reports_upstream_errors(monkeypatch):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(500)),
+    )
+    monkeypatch.setattr(charts, "_client", client)
+
+    result = anyio.run(lambda: create_chart_url({"type": "bar"}, short=True))
+
+    assert result.startswith("Error generating QuickChart URL:")
+
+
+def test_create_chart_url_surfaces_quickchart_error_detail(monkeypatch):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(400, headers={"x-quickchart-error": "bad config"})
+        ),
+    )
+    monkeypatch.setattr(charts, "_client", client)
+
+    result = anyio.run(lambda: create_chart_url({"type": "bar"}, short=True))
+
+    assert result.endswith("400\nbad config")
+
+
+def test_create_chart_url_rejects_unsuccessful_response(monkeypatch):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"success": False})),
+    )
+    monkeypatch.setattr(charts, "_client", client)
+
+    result = anyio.run(lambda: create_chart_url({"type": "bar"}, short=True))
+
+    assert result == "Error generating QuickChart URL: Chart creation endpoint failed to create chart"
+
+
+def test_create_chart_urls_issues_requests_concurrently(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_create_short_url(body: bytes) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await anyio.sleep(0.01)
+        in_flight -= 1
+        if b"broken" in body:
+            raise RuntimeError("boom")
+        return f"https://quickchart.io/chart/render/{json.loads(body)['chart']['type']}"
+
+    monkeypatch.setattr(charts, "_create_short_url", fake_create_short_url)
+    configs = [{"type": "bar"}, {"type": "broken"}, {"type": "line"}]
+
+    urls = anyio.run(lambda: create_chart_urls(configs, width=300, short=True))
+
+    assert urls == [
+        "https://quickchart.io/chart/render/bar",
+        "Error generating QuickChart URL: boom",
+        "https://quickchart.io/chart/render/line",
+    ]
+    assert peak == 3
+
+
+def test_lifespan_warms_the_shared_client(upstream):
+    async def run_session():
+        async with charts.lifespan(charts.mcp):
+            await anyio.sleep(0.01)
+
+    anyio.run(run_session)
+
+    assert [(r.method, r.url.path) for r in upstream] == [("HEAD", "/chart/create")]
+    assert not charts._client.is_closed
+
+
+def test_create_chart_urls_reports_serialization_errors_per_slot():
+    urls = anyio.run(lambda: create_chart_urls([{"type": "bar"}, {"type": "bar", "data": {1, 2}}]))
+
+    assert urls[0].startswith(charts.CHART_BASE)
+    assert urls[1].startswith("Error generating QuickChart URL:")
+
+
+def test_serve_closes_shared_client(upstream, monkeypatch):
+    async def run_async(transport):
+        assert not charts._client.is_closed
+
+    monkeypatch.setattr(charts.mcp, "run_async", run_async)
+
+    anyio.run(charts.serve)
+
+    assert charts._client.is_closed
+
+
+def test_schema_resource_returns_module_constant():
+    assert charts.get_chartjs_schema_info() is charts._SCHEMA_INFO